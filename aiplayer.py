@@ -1,11 +1,136 @@
-import random, itertools
+import random, itertools, functools, time
 from player import Player, Card
+from card import RANK_INDICES, SUIT_INDICES, VALUES
+
+VALUES_BY_RANK = tuple(min(rank_index, 10) for rank_index in range(len(Card.ranks)))
+
+def _hand_key(hand):
+    # Pack the hand's card ids, in hand order, into a single int (6 bits per card) to key the caches below
+    hand_key = 0
+    for card in hand:
+        hand_key = hand_key << 6 | card._card + 1
+    return hand_key
+
+def _hand_ids(hand_key):
+    # Unpack the card ids from a hand key
+    hand_ids = []
+    while hand_key:
+        hand_ids.append((hand_key & 63) - 1)
+        hand_key >>= 6
+    return hand_ids[::-1]
+
+@functools.lru_cache(maxsize=65536)
+def _discard_option_positions(hand_key):
+    # Discard options depend only on which cards are held (and in what order), so they are found
+    # from card ids alone, cached, and shared by every AIPlayer as tuples of positions in the hand
+    hand_ids = _hand_ids(hand_key)
+    discard_options = [(i,) for i in range(len(hand_ids))]  # individual cards
+    ranks = [RANK_INDICES[card_id] for card_id in hand_ids]
+
+    # Split hand into jokers and non-jokers
+    jokers = [i for i, rank in enumerate(ranks) if rank == 0]
+    non_jokers = [i for i, rank in enumerate(ranks) if rank != 0]
+
+    # Only cards of the same rank (sets) or the same suit (runs) can be discarded together,
+    # so group the non-jokers by rank and by suit and only combine cards within a group
+    by_rank, by_suit = {}, {}
+    for i in non_jokers:
+        by_rank.setdefault(ranks[i], []).append(i)
+        by_suit.setdefault(SUIT_INDICES[hand_ids[i]], []).append(i)
+
+    combos = []
+    for group in by_rank.values():
+        for combo_size in range(2, len(group) + 1):
+            for combo in itertools.combinations(group, combo_size):
+                combos.append((combo_size, combo, True))
+    for group in by_suit.values():
+        for combo_size in range(2, len(group) + 1):
+            for combo in itertools.combinations(group, combo_size):
+                # Only keep runs with no more gaps than there are jokers to fill them
+                combo_ranks = [ranks[i] for i in combo]
+                if max(combo_ranks) - min(combo_ranks) + 1 - combo_size <= len(jokers):
+                    combos.append((combo_size, combo, False))
+    combos.sort()  # same order as combining all the non-jokers by size
+
+    for _, combo, is_set in combos:
+        if is_set:
+            for num_jokers in range(len(jokers) + 1):  # add jokers to set
+                for joker_combo in itertools.combinations(jokers, num_jokers):
+                    discard_options.append(combo + joker_combo)
+        # Check if combo of the same suit can be turned into a run using jokers
+        else:
+            sorted_combo = sorted(combo, key=ranks.__getitem__)
+
+            # Build the run in one pass, filling each gap with the next jokers (there are always enough)
+            run = [sorted_combo[0]]
+            joker_index = 0
+            for previous, position in zip(sorted_combo, sorted_combo[1:]):
+                gap = ranks[position] - ranks[previous] - 1
+                run.extend(reversed(jokers[joker_index:joker_index + gap]))
+                joker_index += gap
+                run.append(position)
+
+            # Add remaining jokers at the beginning and end of the run
+            remaining_jokers = jokers[joker_index:]
+            for joker in remaining_jokers:
+                if ranks[run[0]] > 1:
+                    discard_options.append((joker, *run))  # add to the beginning if the first card isn't Ace
+                if ranks[run[-1]] < 13:
+                    discard_options.append((*run, joker))  # add to the end if the last card isn't King
+
+            if len(run) >= 3:
+                discard_options.append(tuple(run))  # add the potential run with jokers
+
+    return tuple(discard_options)
+
+@functools.lru_cache(maxsize=65536)
+def _discard_option_points(hand_key):
+    # Points of each discard option of a hand, in the order _discard_option_positions lists them
+    hand_ids = _hand_ids(hand_key)
+    return tuple(sum(VALUES[hand_ids[i]] for i in positions) for positions in _discard_option_positions(hand_key))
+
+@functools.lru_cache(maxsize=65536)
+def _best_discard_points(hand_key):
+    # The most points that can be discarded from a hand given by its key. Card values are never
+    # negative, so the best set is a whole rank group and the best run is a whole window of a
+    # suit group; this finds the same maximum as _discard_option_positions without enumerating
+    num_jokers = 0
+    rank_counts, suit_ranks = {}, {}
+    while hand_key:
+        card_id = (hand_key & 63) - 1  # card order doesn't matter here, so unpack in place
+        hand_key >>= 6
+        rank = RANK_INDICES[card_id]
+        if rank == 0:
+            num_jokers += 1
+        else:
+            rank_counts[rank] = rank_counts.get(rank, 0) + 1
+            suit_ranks.setdefault(SUIT_INDICES[card_id], []).append(rank)
+
+    # Single cards and sets
+    best_points = max((count * VALUES_BY_RANK[rank] for rank, count in rank_counts.items()), default=0)
+
+    # Runs, grown one card at a time from each starting card
+    for ranks in suit_ranks.values():
+        if len(ranks) < 2:
+            continue
+        ranks.sort()
+        for i in range(len(ranks) - 1):
+            run_points = VALUES_BY_RANK[ranks[i]]
+            for j in range(i + 1, len(ranks)):
+                if ranks[j] - ranks[i] - (j - i) > num_jokers:
+                    break  # not enough jokers to fill the gaps, and they only grow with j
+                run_points += VALUES_BY_RANK[ranks[j]]
+                if run_points > best_points and (j - i >= 2 or num_jokers):  # two cards need a joker
+                    best_points = run_points
+
+    return best_points
 
 class AIPlayer(Player):
     def __init__(self, name):
         super().__init__(name)
         self.other_players = {}
         self.draw_options = []
+        self.decision_time_budget = None  # seconds to spend searching a move, or None to search every option
 
     def observe_round(self, round_info):
         """
@@ -25,29 +150,30 @@ class AIPlayer(Player):
                     'estimated_score': 50  # Initializing the estimated_score
                 }
 
-    def observe_turn(self, turn_info, discard_pile, draw_options):
+    def observe_turn(self, turn_info, draw_options):
         """
         Update the AI's knowledge based on the information given after each turn.
 
         Args:
             turn_info (dict): A dictionary containing information about the player who just played, the number of cards remaining in their hand, the card(s) they discarded, and the card they drew if it was from the discard pile.
-            discard_pile (list): The current discard pile.
+            draw_options (list): The cards that can be drawn from the discard pile on the next turn.
         """
         player_name = turn_info['player'].name
         self.draw_options = draw_options
-        if player_name in self.other_players:
-            self.other_players[player_name]['hand_count'] = turn_info['hand_count']
+        player_info = self.other_players.get(player_name)
+        if player_info is not None:
+            player_info['hand_count'] = turn_info['hand_count']
 
             discarded_cards = turn_info['discarded_cards']
             drawn_card = turn_info['drawn_card']  # This is None if the card was drawn from the deck
 
-            for card in discarded_cards:
-                if card in self.other_players[player_name]['known_cards']:
-                    self.other_players[player_name]['known_cards'].remove(card)
+            # Cards are unique, so drop any discarded known cards by id in a single pass
+            discarded_ids = {card._card for card in discarded_cards}
+            player_info['known_cards'] = [card for card in player_info['known_cards'] if card._card not in discarded_ids]
             if drawn_card is not None:
                 if isinstance(drawn_card, int): # HACK because for some reason send over the index at start of hand
                     drawn_card = draw_options[drawn_card]
-                self.other_players[player_name]['known_cards'].append(drawn_card)
+                player_info['known_cards'].append(drawn_card)
 
             # After observing the turn, estimate the hand values
             self.estimate_hand_values()
@@ -58,11 +184,11 @@ class AIPlayer(Player):
         """
         # First, check if the AI estimates that another player is going to declare Yaniv on their next turn
         # and the AI can perform an action so their hand sums to a score that would allow them to reset.
-        for player_info in self.other_players.values():
-            if player_info['estimated_score'] <= 5:
-                reset_action = self.action_to_reset()
-                if reset_action is not None:
-                    return reset_action
+        # The reset search doesn't depend on which player is the threat, so run it at most once.
+        if self._min_estimated_score() <= 5:
+            reset_action = self.action_to_reset()
+            if reset_action is not None:
+                return reset_action
 
         # If not, play to win the hand with the lowest score.
         # For example, the AI could try to minimize the points in its hand by discarding high-point cards.
@@ -75,13 +201,19 @@ class AIPlayer(Player):
         """
         # The AI can reset if there is discard and replace with a card it could draw from discard_options,
         # where (drawn card value - discard value + AIPlayer's current score) % 50 = 0.
-        for discard_option in self._get_discard_options():  # consider sets and runs
-            for draw_card in self.draw_options:
-                if (sum(card.value for card in discard_option) - draw_card.value + self.score) % 50 == 0:
-                    return {
-                        'discard': discard_option,
-                        'draw': self.draw_options.index(draw_card),
-                    }
+        # Index the draw options by value mod 50, so each discard needs one lookup instead of a scan
+        draw_index_by_residue = {}
+        for i, draw_card in enumerate(self.draw_options):
+            draw_index_by_residue.setdefault(draw_card.value % 50, i)
+
+        discard_options = self._get_discard_options()  # consider sets and runs
+        for discard_option, discard_points in zip(discard_options, self._get_discard_option_points()):
+            needed_residue = (discard_points + self.score) % 50
+            if needed_residue in draw_index_by_residue:
+                return {
+                    'discard': discard_option,
+                    'draw': draw_index_by_residue[needed_residue],
+                }
         return None
 
     def action_to_minimize_score(self):
@@ -100,49 +232,14 @@ class AIPlayer(Player):
     def _get_discard_options(self, hand=None):
         if hand is None:
             hand = self.hand
-        discard_options = [[card] for card in hand]  # individual cards
-
-        # Split hand into jokers and non-jokers
-        jokers = [card for card in hand if card.rank == 'Joker']
-        non_jokers = [card for card in hand if card.rank != 'Joker']
-
-        # Check for valid sets and runs in the non-jokers
-        for combo_size in range(2, len(non_jokers) + 1):
-            for combo in itertools.combinations(non_jokers, combo_size):
-                # Check if combo is a set
-                if len(set(card.rank for card in combo)) == 1:
-                    for num_jokers in range(len(jokers) + 1):  # add jokers to set
-                        for joker_combo in itertools.combinations(jokers, num_jokers):
-                            discard_options.append(list(combo) + list(joker_combo))
-                # Check if combo of the same suit can be turned into a run using jokers
-                elif len(set(card.suit for card in combo)) == 1:
-                    sorted_combo = sorted(combo, key=lambda card: card.rank_index())
-
-                    # Calculate gaps
-                    gaps = [(i, sorted_combo[i+1].rank_index() - sorted_combo[i].rank_index() - 1)
-                            for i in range(len(sorted_combo) - 1)
-                            if sorted_combo[i+1].rank_index() - sorted_combo[i].rank_index() > 1]
-
-                    if sum(gap for _, gap in gaps) <= len(jokers):
-                        joker_index = 0
-                        for i, gap in gaps:
-                            for _ in range(gap):
-                                if joker_index < len(jokers):
-                                    sorted_combo.insert(i + 1, jokers[joker_index])
-                                    joker_index += 1
-
-                        # Add remaining jokers at the beginning and end of the run
-                        remaining_jokers = jokers[joker_index:]
-                        for joker in remaining_jokers:
-                            if sorted_combo[0].rank_index() > 1:
-                                discard_options.append([joker] + sorted_combo)  # add to the beginning if the first card isn't Ace
-                            if sorted_combo[-1].rank_index() < 13:
-                                discard_options.append(sorted_combo + [joker])  # add to the end if the last card isn't King
-                        
-                        if len(sorted_combo) >= 3:
-                            discard_options.append(sorted_combo)  # add the potential run with jokers
-
-        return discard_options
+        option_positions = _discard_option_positions(_hand_key(hand))
+        return [[hand[i] for i in option] for option in option_positions]
+
+    def _get_discard_option_points(self, hand=None):
+        # Points of each option from _get_discard_options, in the same order
+        if hand is None:
+            hand = self.hand
+        return _discard_option_points(_hand_key(hand))
 
     def _option_value(self, option):
         return sum(card.value for card in option)
@@ -154,47 +251,63 @@ class AIPlayer(Player):
         next_discard_options = self._get_discard_options(new_hand)
         best_next_discard_options = self._get_best_discard_options(next_discard_options)
         
-        future_expected_points = float('inf')
-
-        best_next_discard_option = None
-        for discard_option in best_next_discard_options:
-            expected_points = self._calculate_new_total_points(new_hand, discard_option)
-            if expected_points < future_expected_points:
-                future_expected_points = expected_points
-                best_next_discard_option = discard_option
-            if expected_points == future_expected_points: 
-                future_expected_points = expected_points
-                best_next_discard_option = discard_option
-        
-        return future_expected_points, best_next_discard_option
+        if not best_next_discard_options:
+            return float('inf'), None
+
+        # Every best option discards the same points and so leaves the same total; keep the last one
+        best_next_discard_option = best_next_discard_options[-1]
+        return self._calculate_new_total_points(new_hand, best_next_discard_option), best_next_discard_option
 
     def _get_best_action(self, post_discard_hand):
         best_score = float('inf')
         best_draw_card = 'deck'
 
+        # The post-discard hand is the same for every draw, so only the drawn card varies
+        post_discard_key = _hand_key(post_discard_hand)
+        post_discard_points = sum(card.value for card in post_discard_hand)
+
         # Iterate over all possible cards to draw
         for i, draw_card in enumerate(self.draw_options):
-            # Simulate action for drawing this card after discarding discard_option
-            score, next_discard_option = self._simulate_action(post_discard_hand, draw_card)
+            # Score drawing this card after discarding discard_option, as _simulate_action would
+            best_next_discard_points = _best_discard_points(post_discard_key << 6 | draw_card._card + 1)
+            if best_next_discard_points == 0:
+                continue  # nothing worth discarding next turn (see _get_best_discard_options)
+            score = post_discard_points + draw_card.value - best_next_discard_points
 
             # Update the best action if the current score is lower or same w lower hand
             if score < best_score:
                 best_score = score
                 best_draw_card = i
+                if best_score == 0:
+                    break  # no other draw can score lower
 
         return best_draw_card, best_score
 
     def _simulate_next_turn(self):
-        best_discard = self._get_best_discard_options(self._get_discard_options())[0]
-        best_score = sum(card.value for card in self.hand) - sum(card.value for card in best_discard) + 0 # Assume draw joker...
+        discard_options = self._get_discard_options()
+        option_points = self._get_discard_option_points()
+        best_discard = self._get_best_discard_options(discard_options, option_points)[0]
+
+        best_discard_points = self._option_value(best_discard)
+        best_score = sum(card.value for card in self.hand) - best_discard_points + 0 # Assume draw joker...
         best_draw_card = 'deck'
 
+        # The best discard drawing from the deck is always a legal move, so the search can stop at any time
+        deadline = None if self.decision_time_budget is None else time.monotonic() + self.decision_time_budget
+
         # Iterate over all possible discard options
-        discard_options = self._get_discard_options()
-        for discard_option in discard_options:
+        option_positions = _discard_option_positions(_hand_key(self.hand))
+        for discard_option, positions, discard_points in zip(discard_options, option_positions, option_points):
+            if deadline is not None and time.monotonic() > deadline:
+                break  # out of time, keep the best action found so far
+
+            # No hand scores below 0, so once the best score is 0 only a lower discard can still win the tie-break
+            if best_score == 0 and discard_points >= best_discard_points:
+                continue
+
             # Create a hand after discarding the current option
-            post_discard_hand = [card for card in self.hand if card not in discard_option]
-            
+            post_discard_hand = [card for i, card in enumerate(self.hand) if i not in positions]
+
             # For each possible discard, get the best action for the potential next turn
             draw_card, score = self._get_best_action(post_discard_hand)
 
@@ -203,39 +316,42 @@ class AIPlayer(Player):
                 best_score = score
                 best_draw_card = draw_card
                 best_discard = discard_option
+                best_discard_points = discard_points
             if score == best_score:
-                if sum(card.value for card in discard_option) < sum(card.value for card in best_discard):
+                if discard_points < best_discard_points:
                     best_score = score
                     best_draw_card = draw_card
                     best_discard = discard_option
+                    best_discard_points = discard_points
         draw_string = best_draw_card if best_draw_card == 'deck' else str(self.draw_options[best_draw_card])
         return {'draw': best_draw_card, 'discard': best_discard, 'points': best_score}
 
-    def _get_best_discard_options(self, discard_options):
+    def _get_best_discard_options(self, discard_options, option_points=None):
         """
         Determine the best option to discard from the given list of discard options.
+        The options' points can be passed in (as from _get_discard_option_points) to save summing them.
         """
-        best_discard_options = []    
-        best_points = 0 # Initialize
-
-        for option in discard_options:
-            discard_points = sum(card.value for card in option)
-            if discard_points > best_points:
-                best_points = discard_points
+        if option_points is None:
+            option_points = [sum(card.value for card in option) for option in discard_options]
+        best_discard_options = []
+        best_key = (0, 0) # (points, -number of cards): options worth no points are never best
+
+        for option, points in zip(discard_options, option_points):
+            option_key = (points, -len(option)) # fewer cards keeps jokers when you can
+            if option_key > best_key:
+                best_key = option_key
                 best_discard_options = [option]
-            elif discard_points == best_points and len(best_discard_options) > 0: # keep jokers when you can
-                if len(option) < len(best_discard_options[0]):
-                    best_discard_options = [option]
-                elif len(option) == len(best_discard_options[0]):
-                    best_discard_options.append(option)
-        
+            elif option_key == best_key:
+                best_discard_options.append(option)
+
         return best_discard_options
 
     def _calculate_new_total_points(self, potential_hand, discard_option):
         """
         Calculate the new total points given a hand and the best discard option.
         """
-        return sum(card.value for card in potential_hand if card not in discard_option)
+        discard_ids = {card._card for card in discard_option}
+        return sum(card.value for card in potential_hand if card._card not in discard_ids)
 
     def should_declare_yaniv(self):
         """
@@ -247,21 +363,24 @@ class AIPlayer(Player):
         if own_hand_value > 5:
             return False
         
-        if all(player_info['estimated_score'] > own_hand_value for player_info in self.other_players.values()):
-            return True
-        return False
+        return self._min_estimated_score() > own_hand_value
 
     def estimate_hand_values(self):
         """
         Estimate the hand values for the other players.
         """
+        # Cards known to be held by any opponent are the same for every player, so gather them once
+        known_cards = [card for other_info in self.other_players.values() for card in other_info['known_cards']]
         for player_name, player_info in self.other_players.items():
-            known_cards = [card for player_info in self.other_players.values() for card in player_info['known_cards']]
             # print(f"-- Known cards for {player_name}: {known_cards}")
             unknown_cards_count = player_info['hand_count'] - len(player_info['known_cards'])
             estimated_unknown_card_score = self.estimate_unknown_cards(unknown_cards_count, known_cards)
             player_info['estimated_score'] = sum(card.value for card in player_info['known_cards']) + estimated_unknown_card_score
 
+    def _min_estimated_score(self):
+        # The lowest estimated hand value among the other players (infinite when there are none)
+        return min((player_info['estimated_score'] for player_info in self.other_players.values()), default=float('inf'))
+
     def estimate_unknown_cards(self, num_unknown_cards, known_cards):
         """
         TODO: Should probably not naively Yaniv, this just being random
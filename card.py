@@ -1,12 +1,17 @@
+# Lookup tables indexed by card id (Card._card), so rank/suit/value never need recomputing
+RANK_INDICES = tuple(0 if i < 2 else (i - 2) // 4 + 1 for i in range(54))
+SUIT_INDICES = tuple(i + 2 if i < 2 else (i - 2) % 4 for i in range(54))
+VALUES = tuple(min(rank_index, 10) for rank_index in RANK_INDICES)
+
 class Card:
-    ranks = ['Joker', 'A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K']
-    suits = ['Clubs', 'Diamonds', 'Hearts', 'Spades']
+    ranks = ('Joker', 'A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K')
+    suits = ('Clubs', 'Diamonds', 'Hearts', 'Spades')
 
     def __init__(self, rank, suit=None):
         if isinstance(rank, int) and suit is None:
             self._card = rank
-            self.rank = Card.ranks[self.rank_index()]
-            self.suit = Card.suits[self.suit_index()]
+            self.rank = Card.ranks[RANK_INDICES[rank]]
+            self.suit = Card.suits[SUIT_INDICES[rank]]
         elif isinstance(rank, str) and isinstance(suit, str):
             rank_index = self.ranks.index(rank)
             suit_index = self.suits.index(suit)
@@ -16,17 +21,13 @@ class Card:
                 self._card = (rank_index - 1) * 4 + suit_index + 2
             self.rank = rank
             self.suit = suit
-        self.value = min(self.rank_index(), 10)
+        self.value = VALUES[self._card]
 
     def rank_index(self):
-        if self._card < 2:  # If it's a Joker
-            return 0
-        return (self._card - 2) // 4 + 1
+        return RANK_INDICES[self._card]
 
     def suit_index(self):
-        if self._card < 2:  # If it's a Joker
-            return self._card + 2
-        return (self._card - 2) % 4
+        return SUIT_INDICES[self._card]
 
     def __lt__(self, other):
         return self._card < other._card
@@ -47,11 +48,11 @@ class Card:
 
     @staticmethod
     def deserialize(card):
-        return Card(card)
+        return CARDS[card]
     
     @staticmethod
     def create_deck():
-        deck = []
-        for i in range(54):
-            deck.append(Card(i))
-        return deck
\ No newline at end of file
+        return list(CARDS)
+
+# Every card, indexed by id. Cards are never modified once made, so decks and deserializing share these
+CARDS = tuple(Card(i) for i in range(54))
@@ -7,11 +7,11 @@ class Player:
         self.score = 0
     
     def to_dict(self):
-        return {'name': self.name, 'score': self.score, 'hand': [card.to_dict() for card in self.hand]}
+        return {'name': self.name, 'score': self.score, 'hand': [card.serialize() for card in self.hand]}
 
     @classmethod
     def from_dict(cls, data):
         player = cls(data['name'])
-        player.hand = [Card.from_dict(card_data) for card_data in data['hand']]
+        player.hand = [Card.deserialize(card_data) for card_data in data['hand']]
         player.score = data['score']
         return player
@@ -51,6 +51,13 @@ class TestAIPlayer(unittest.TestCase):
         self.assertNotIn([Card('4', 'Hearts'), Card('Joker', 'Hearts'), Card('7', 'Hearts')], actual_output)
         self.assertNotIn([Card('4', 'Hearts'), Card('Joker', 'Hearts'), Card('7', 'Hearts'), Card('Joker','Spades')], actual_output)
 
+    def test_get_discard_options_two_gaps(self):
+        # Each gap gets its own joker
+        self.aiplayer.hand = [Card('3', 'Hearts'), Card('5', 'Hearts'), Card('7', 'Hearts'), Card('Joker', 'Spades'), Card('Joker', 'Hearts')]
+        actual_output = self.aiplayer._get_discard_options()
+        self.assertIn([Card('3', 'Hearts'), Card('Joker', 'Spades'), Card('5', 'Hearts'), Card('Joker', 'Hearts'), Card('7', 'Hearts')], actual_output)
+        self.assertNotIn([Card('3', 'Hearts'), Card('Joker', 'Spades'), Card('Joker', 'Hearts'), Card('5', 'Hearts'), Card('7', 'Hearts')], actual_output)
+
     def test_get_discard_options_invalid(self):
         # Invalid runs
         self.aiplayer.hand = [Card('4', 'Hearts'), Card('Joker', 'Hearts'), Card('6', 'Clubs'), Card('6','Hearts'), Card('9', 'Hearts')]
@@ -132,6 +139,17 @@ class TestAIPlayer(unittest.TestCase):
         best_discard_options = self.aiplayer._get_best_discard_options(discard_options)
         self.assertEqual(best_discard_options, [[Card('10', 'Hearts')], [Card('J', 'Hearts')], [Card('K', 'Hearts')]])
 
+    # Test finding an action that lands the score on a multiple of 50
+    def test_action_to_reset(self):
+        self.aiplayer.score = 44
+        self.aiplayer.hand = [Card('K', 'Hearts'), Card('2', 'Clubs')]
+        self.aiplayer.draw_options = [Card('9', 'Spades'), Card('4', 'Diamonds')]
+        action = self.aiplayer.action_to_reset()
+        self.assertEqual(action, {'discard': [Card('K', 'Hearts')], 'draw': 1})
+
+        self.aiplayer.draw_options = [Card('9', 'Spades')]
+        self.assertIsNone(self.aiplayer.action_to_reset())
+
     # Test calculation of new total points
     def test_calculate_new_total_points(self):
         self.aiplayer.hand = [Card('J', 'Hearts'), Card('Q', 'Hearts'), Card('K', 'Hearts')]
@@ -154,6 +172,15 @@ class TestAIPlayer(unittest.TestCase):
         self.aiplayer.draw_options = self.aiplayer.discard_pile
         self.assertEqual(self.aiplayer._simulate_next_turn()['draw'], 1)
 
+    def test_simulate_next_turn_time_budget(self):
+        """ Out of time before any option is searched """
+        self.aiplayer.hand = [Card('9', 'Hearts'), Card('10', 'Hearts'), Card('J', 'Hearts'), Card('K', 'Hearts')]
+        self.aiplayer.draw_options = [Card('K', 'Spades'), Card('Q','Hearts')]
+        self.aiplayer.decision_time_budget = -1
+        action = self.aiplayer._simulate_next_turn()
+        self.assertEqual(action['discard'], [Card('9', 'Hearts'), Card('10', 'Hearts'), Card('J', 'Hearts')])
+        self.assertEqual(action['draw'], 'deck')
+
     def test_simulate_next_turn_run_2(self):
         """ Draw for a set against complete run """
         self.aiplayer.hand = [Card('9', 'Hearts'), Card('10', 'Hearts'), Card('J', 'Hearts'), Card('K', 'Hearts')]
@@ -238,6 +265,22 @@ class TestAIPlayer(unittest.TestCase):
         self.assertEqual(best_discard_option, [Card('9', 'Hearts'), Card('10', 'Hearts'), Card('J', 'Hearts')])
         self.assertEqual(new_total_points, 20)
 
+    def test_get_best_action_matches_simulate_action(self):
+        post_discard_hand = [Card('9', 'Hearts'), Card('10', 'Hearts'), Card('K', 'Hearts')]
+        self.aiplayer.draw_options = [Card('K', 'Spades'), Card('J', 'Hearts'), Card('Joker', 'Spades')]
+        scores = [self.aiplayer._simulate_action(post_discard_hand, card)[0] for card in self.aiplayer.draw_options]
+        draw, score = self.aiplayer._get_best_action(post_discard_hand)
+        self.assertEqual(score, min(scores))
+        self.assertEqual(draw, scores.index(min(scores)))
+
+        # Joker-filled runs and sets
+        post_discard_hand = [Card('Joker', 'Hearts'), Card('8', 'Clubs'), Card('Q', 'Clubs'), Card('8', 'Spades')]
+        self.aiplayer.draw_options = [Card('10', 'Clubs'), Card('8', 'Hearts'), Card('9', 'Clubs'), Card('2', 'Spades')]
+        scores = [self.aiplayer._simulate_action(post_discard_hand, card)[0] for card in self.aiplayer.draw_options]
+        draw, score = self.aiplayer._get_best_action(post_discard_hand)
+        self.assertEqual(score, min(scores))
+        self.assertEqual(draw, scores.index(min(scores)))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -56,5 +56,19 @@ class TestCardSorting(unittest.TestCase):
         self.assertEqual(cards[1].value, 0)
         self.assertEqual(cards[6].value, 10)
 
+    def test_card_lookup_tables(self):
+        for card in Card.create_deck():
+            same_card = Card(card.rank, card.suit)
+            self.assertEqual(same_card._card, card._card)
+            self.assertEqual(same_card.value, card.value)
+            self.assertEqual(Card.ranks[card.rank_index()], card.rank)
+            self.assertEqual(Card.suits[card.suit_index()], card.suit)
+        self.assertEqual(sum(card.value for card in Card.create_deck()), 340)
+
+    def test_card_serialization(self):
+        for card in Card.create_deck():
+            self.assertEqual(Card.deserialize(card.serialize()), card)
+        self.assertIs(Card.deserialize(7), Card.deserialize(7))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
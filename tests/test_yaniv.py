@@ -190,6 +190,15 @@ class TestYanivGame(unittest.TestCase):
         self.assertEqual(self.player2.hand, [Card('2', 'Hearts'), Card('3', 'Diamonds'), Card('10', 'Hearts')])
         self.assertEqual(self.game.discard_pile[-1], Card('4', 'Spades'))
 
+    def test_to_dict_round_trip(self):
+        self.game.start_game()
+        self.player1.score = 42
+        game = YanivGame.from_dict(self.game.to_dict())
+        self.assertEqual([player.hand for player in game.players], [self.player1.hand, self.player2.hand])
+        self.assertEqual(game.players[0].score, 42)
+        self.assertEqual(game.discard_pile, self.game.discard_pile)
+        self.assertEqual(sorted(game.deck), sorted(self.game.deck))
+
     def test_end_of_game(self):
         self.player1.score = 69
         self.player2.score = 99
@@ -1,5 +1,6 @@
 import random, uuid
 from aiplayer import *
+from card import CARDS
 
 class YanivGame:
     def __init__(self, players=None):
@@ -33,9 +34,11 @@ class YanivGame:
         game.discard_pile = [Card.deserialize(card_data) for card_data in data['discard_pile']]
         game.last_discard = game.discard_pile[-data['last_discard_size']:]
         
-        game._create_deck()
+        # The deck is every card not in the discard pile or a hand; mark those by id
+        seen_mask = 0
         for card in game.discard_pile + [card for player in game.players for card in player.hand]:
-            game.deck.remove(card)
+            seen_mask |= 1 << card.serialize()
+        game.deck = [card for card in CARDS if not seen_mask >> card.serialize() & 1]
         game._shuffle_deck()
 
         return game
@@ -104,17 +107,18 @@ class YanivGame:
         drawn_card = self.last_discard[action['draw']] if action['draw'] != 'deck' else None
         self._discard_cards(player, action['discard'])
         
-        # Inform AIPlayers what happened   
+        # Inform AIPlayers what happened; every one of them sees the same turn and draw options
+        turn_info = {
+            "player": player,
+            "action": action,
+            "hand_count": len(player.hand),
+            "discarded_cards": action['discard'],
+            "drawn_card": drawn_card
+        }
+        draw_options = self._get_draw_options()
         for other_player in self.players:
             if isinstance(other_player, AIPlayer) and other_player != player:
-                turn_info = {
-                    "player": player,
-                    "action": action,
-                    "hand_count": len(player.hand),
-                    "discarded_cards": action['discard'],
-                    "drawn_card": drawn_card
-                }
-                other_player.observe_turn(turn_info, self.discard_pile, self._get_draw_options())
+                other_player.observe_turn(turn_info, draw_options)
         
         self._next_turn()
         return action
@@ -301,11 +305,8 @@ class YanivGame:
         update_info = {}
 
         if yaniv_points < min_points:
-            for player in self.players:
-                if player == yaniv_player:
-                    player.score += 0
-                else:
-                    player.score += sum(card.value for card in player.hand)
+            for player, points in zip(other_players, other_players_points):
+                player.score += points
         else:
             yaniv_player.score += 30
             update_info['assaf'] = {'assafed_by': min_points_player, 'assafed': yaniv_player}